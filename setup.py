@@ -13,4 +13,6 @@ setuptools.setup(
         url="https://github.com/birb007/veracity",
         packages=setuptools.find_packages(),
         python_requires=">=3.8",
+        install_requires=["pycosat>=0.6"],
+        extras_require={"jit": ["numba>=0.55", "numpy>=1.21"]},
 )
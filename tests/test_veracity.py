@@ -1,4 +1,7 @@
+import pickle
+import sys
 import unittest
+import unittest.mock
 
 from veracity import *
 
@@ -51,6 +54,33 @@ class TestParser(unittest.TestCase):
             ),
         )
 
+    def test_shared_subexpression(self):
+        expr = Parser("(P∧Q)∨(P∧Q)").parse()
+        self.assertIs(expr.lhs, expr.rhs)
+
+    def test_pickle(self):
+        expr = Parser("(P∧Q)→¬R").parse()
+        self.assertFalse(hasattr(expr, "__dict__"))
+        self.assertEqual(pickle.loads(pickle.dumps(expr)), expr)
+
+    def test_tokenise(self):
+        parser = Parser("P1_²∧ (¬Q)")
+        self.assertEqual(
+            parser.tokenise(),
+            [
+                Variable(identifier="P"),
+                veracity.Token.CONJUNCTION,
+                veracity.Token.LEFT_PAREN,
+                veracity.Token.NEGATION,
+                Variable(identifier="Q"),
+                veracity.Token.RIGHT_PAREN,
+            ],
+        )
+
+    def test_shared_variable(self):
+        tokens = Parser("P∧P").tokenise()
+        self.assertIs(tokens[0], tokens[2])
+
     def test_bad_char(self):
         parser = Parser("P ∨    \n¬ Q")
         self.assertEqual(
@@ -62,6 +92,77 @@ class TestParser(unittest.TestCase):
         )
 
 
+class TestNormalForms(unittest.TestCase):
+    def test_nnf_de_morgan(self):
+        expr = veracity.to_nnf(Parser("¬(P∨¬Q)").parse())
+        self.assertEqual(
+            expr,
+            Conjunction(
+                lhs=Variable(identifier="Q"),
+                rhs=Negation(operand=Variable(identifier="P")),
+            ),
+        )
+
+    def test_nnf_implication(self):
+        expr = veracity.to_nnf(Parser("P→Q").parse())
+        self.assertEqual(
+            expr,
+            Disjunction(
+                lhs=Variable(identifier="Q"),
+                rhs=Negation(operand=Variable(identifier="P")),
+            ),
+        )
+
+    def test_cnf_positive_polarity(self):
+        clauses, var_id = veracity.to_cnf(Parser("P∧Q").parse())
+        q, p = var_id[Variable(identifier="Q")], var_id[Variable(identifier="P")]
+        self.assertEqual(clauses, [[-1, q], [-1, p], [1]])
+
+    def test_flatten(self):
+        expr = veracity.flatten(Parser("(P∧Q∧R)∨¬(S∨T)").parse())
+        self.assertEqual(
+            expr,
+            NAryDisjunction(
+                operands=(
+                    Negation(
+                        operand=NAryDisjunction(
+                            operands=(
+                                Variable(identifier="T"),
+                                Variable(identifier="S"),
+                            )
+                        )
+                    ),
+                    NAryConjunction(
+                        operands=(
+                            Variable(identifier="R"),
+                            Variable(identifier="Q"),
+                            Variable(identifier="P"),
+                        )
+                    ),
+                )
+            ),
+        )
+
+    def test_cnf_nary(self):
+        clauses, var_id = veracity.to_cnf(veracity.flatten(Parser("P∨Q∨R").parse()))
+        r, q, p = (var_id[Variable(identifier=name)] for name in "RQP")
+        self.assertEqual(clauses, [[-1, r, q, p], [1]])
+
+    def test_cnf_repeated_operand(self):
+        p = Variable(identifier="P")
+        clauses, _ = veracity.to_cnf(Conjunction(lhs=p, rhs=p))
+        self.assertEqual(clauses, [[-1, 2], [1]])
+
+    def test_unit_propagate(self):
+        clauses, forced = veracity.unit_propagate([[1], [-1, 2], [-2, 3, 4]])
+        self.assertEqual(clauses, [[3, 4]])
+        self.assertEqual(forced, {1: True, 2: True})
+
+    def test_unit_propagate_conflict(self):
+        clauses, _ = veracity.unit_propagate([[1], [-1, 2], [-1, -2]])
+        self.assertEqual(clauses, [[]])
+
+
 class TestSimplifier(unittest.TestCase):
     def test_simplify_const_conj(self):
         parser = Parser("P∧¬P")
@@ -73,6 +174,32 @@ class TestSimplifier(unittest.TestCase):
         expr = veracity.simplify(parser.parse())
         self.assertEqual(expr, Variable(identifier="Q"))
 
+    def test_peephole_double_negation(self):
+        expr = veracity.peephole(Parser("¬¬P∧(Q∨¬Q)").parse())
+        self.assertEqual(expr, Variable(identifier="P"))
+
+    def test_peephole_idempotence(self):
+        expr = veracity.peephole(Parser("(P∧Q)∨(P∧Q)").parse())
+        self.assertEqual(
+            expr,
+            Conjunction(lhs=Variable(identifier="Q"), rhs=Variable(identifier="P")),
+        )
+
+    def test_peephole_tautology(self):
+        self.assertEqual(veracity.peephole(Parser("P→P").parse()), True)
+        self.assertEqual(veracity.solve("P∨¬P"), [{}])
+
+    def test_simplify_shared_subexpressions(self):
+        expr = Variable(identifier="P")
+        for _ in range(64):
+            expr = Disjunction(lhs=expr, rhs=expr)
+        self.assertEqual(veracity.simplify(expr), Variable(identifier="P"))
+
+    def test_simplify_preserves_expr(self):
+        expr = Parser("(P∧¬P)∨Q").parse()
+        veracity.simplify(expr)
+        self.assertEqual(veracity.solve_expr(expr), [{Variable(identifier="Q"): True}])
+
 
 class TestSolver(unittest.TestCase):
     def test_conjunction(self):
@@ -100,6 +227,14 @@ class TestSolver(unittest.TestCase):
             [
                 {
                     Variable(identifier="W"): True,
+                    Variable(identifier="V"): True,
+                    Variable(identifier="R"): True,
+                    Variable(identifier="Q"): True,
+                },
+                {
+                    Variable(identifier="W"): True,
+                    Variable(identifier="U"): True,
+                    Variable(identifier="T"): False,
                     Variable(identifier="R"): True,
                     Variable(identifier="Q"): True,
                 },
@@ -112,11 +247,114 @@ class TestSolver(unittest.TestCase):
             ],
         )
 
+    def test_implication(self):
+        expr = veracity.solve("P→Q")
+        self.assertEqual(
+            expr, [{Variable(identifier="Q"): True}, {Variable(identifier="P"): False}]
+        )
+
+    def test_negated_conjunction(self):
+        cases = veracity.solve_expr(Parser("¬(P∧Q)").parse())
+        self.assertEqual(
+            cases,
+            [{Variable(identifier="Q"): False}, {Variable(identifier="P"): False}],
+        )
+
+    def test_deeply_nested(self):
+        depth = sys.getrecursionlimit() * 2
+        expr = Parser("¬" * depth + "P").parse()
+        self.assertEqual(veracity.solve_expr(expr), [{Variable(identifier="P"): True}])
+        self.assertEqual(len(veracity.stringify(expr)), depth * 3 + 1)
+
+    def test_stringify_constant(self):
+        self.assertEqual(
+            veracity.stringify(veracity.simplify(Parser("P∧¬P").parse())), "F"
+        )
+        expr = Conjunction(lhs=True, rhs=Negation(operand=False))
+        self.assertEqual(veracity.stringify(expr), "(T ∧ (¬F))")
+
+    def test_duplicate_mappings(self):
+        p = Variable(identifier="P")
+        cases = veracity.solve_expr(Disjunction(lhs=p, rhs=Conjunction(lhs=p, rhs=p)))
+        self.assertEqual(cases, [{p: True}])
+
+    def test_parallel(self):
+        expr = Parser("(P∧¬Q)∨(Q∨R)∨¬(P∨R)").parse()
+        expected = veracity.solve_expr(expr)
+        self.assertEqual(veracity.solve_expr(expr, processes=2), expected)
+        with unittest.mock.patch.object(veracity, "ProcessPoolExecutor") as pool:
+            self.assertEqual(veracity.solve_expr(expr, processes=1), expected)
+        pool.assert_not_called()
+        with self.assertRaises(ValueError):
+            veracity.solve("P∨Q", processes=0)
+
     def test_constant(self):
         expr = Conjunction(lhs=True, rhs=Variable(identifier="P"))
         cases = veracity.solve_expr(expr)
         self.assertEqual(cases, [{Variable(identifier="P"): True}])
 
+    def test_repeated_proposition(self):
+        first = veracity.solve("P∨Q")
+        first[0][Variable(identifier="R")] = True
+        with unittest.mock.patch.object(veracity.Parser, "parse") as parse:
+            second = veracity.solve("P∨Q")
+        parse.assert_not_called()
+        self.assertEqual(
+            second,
+            [{Variable(identifier="Q"): True}, {Variable(identifier="P"): True}],
+        )
+
+
+class TestModels(unittest.TestCase):
+    def test_disjunction(self):
+        cases = veracity.models("P∨Q")
+        self.assertCountEqual(
+            cases,
+            [
+                {Variable(identifier="P"): True, Variable(identifier="Q"): True},
+                {Variable(identifier="P"): True, Variable(identifier="Q"): False},
+                {Variable(identifier="P"): False, Variable(identifier="Q"): True},
+            ],
+        )
+
+    def test_implication(self):
+        cases = veracity.models("P→Q", [{Variable(identifier="P"): True}])
+        self.assertEqual(
+            cases, [{Variable(identifier="P"): True, Variable(identifier="Q"): True}]
+        )
+
+    def test_contradiction(self):
+        self.assertEqual(veracity.models("P∧¬P"), [])
+
+    def test_jit_truth_table(self):
+        stmt = "(A∨B∨C∨D∨E∨F∨G)∧¬(F∧G)→(H∧¬A)"
+        with unittest.mock.patch.object(veracity, "JIT_MIN_VARIABLES", 0):
+            cases = veracity.models(stmt)
+        self.assertCountEqual(cases, veracity.models(stmt))
+
+    def test_sat_fallback(self):
+        stmt = "(P→Q)∧¬(R∧Q)∨¬P"
+        with unittest.mock.patch.object(veracity, "TRUTH_TABLE_LIMIT", 0):
+            cases = veracity.models(stmt)
+        self.assertCountEqual(cases, veracity.models(stmt))
+        self.assertEqual(len(cases), 5)
+
+    def test_sat_fallback_forced(self):
+        with unittest.mock.patch.object(veracity, "TRUTH_TABLE_LIMIT", 0):
+            cases = veracity.models("P∧(Q∨¬Q)")
+        self.assertCountEqual(
+            cases,
+            [
+                {Variable(identifier="P"): True, Variable(identifier="Q"): True},
+                {Variable(identifier="P"): True, Variable(identifier="Q"): False},
+            ],
+        )
+
+    def test_constant(self):
+        expr = Conjunction(lhs=True, rhs=Variable(identifier="P"))
+        cases = veracity.models_expr(expr)
+        self.assertEqual(cases, [{Variable(identifier="P"): True}])
+
 
 def test_version():
     assert __version__ == "0.1.0"
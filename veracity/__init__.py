@@ -1,2 +1,2 @@
-from .veracity import Parser, Variable, Conjunction, Disjunction, Implication, Negation, stringify, solve, solve_expr, simplify
+from .veracity import Parser, Variable, Conjunction, Disjunction, Implication, Negation, NAryConjunction, NAryDisjunction, stringify, solve, solve_expr, simplify, models, models_expr, to_cnf, to_nnf, flatten, peephole, unit_propagate
 __version__ = '0.1.0'
@@ -0,0 +1,91 @@
+"""Numba truth table kernel, imported by `veracity._load_jit` on first use."""
+
+from typing import Tuple
+
+import numba
+import numpy as np
+
+from .veracity import _OP_AND, _OP_IMP, _OP_NOT, _OP_OR, _OP_TRUE, _OP_VAR
+
+_LANE_PATTERNS = np.array(
+    [
+        0xAAAAAAAAAAAAAAAA,
+        0xCCCCCCCCCCCCCCCC,
+        0xF0F0F0F0F0F0F0F0,
+        0xFF00FF00FF00FF00,
+        0xFFFF0000FFFF0000,
+        0xFFFFFFFF00000000,
+    ],
+    dtype=np.uint64,
+)
+_LANE_TILE = 256
+
+
+def truth_table(
+    opcodes: Tuple[int, ...],
+    lefts: Tuple[int, ...],
+    rights: Tuple[int, ...],
+    n_variables: int,
+) -> int:
+    """Evaluate instructions from `_compile_ast` over the whole truth table.
+
+    Args:
+        opcodes: Opcode of each instruction.
+        lefts: Left operand of each instruction.
+        rights: Right operand of each instruction.
+        n_variables: Number of distinct variables.
+
+    Returns:
+        Integer with bit `k` set if row `k` satisfies the expression.
+    """
+    rows = 1 << n_variables
+    out = np.empty(max(rows // 64, 1), dtype=np.uint64)
+    _eval_lanes(
+        np.array(opcodes, dtype=np.int32),
+        np.array(lefts, dtype=np.int32),
+        np.array(rights, dtype=np.int32),
+        out,
+    )
+    return int.from_bytes(out.astype("<u8").tobytes(), "little") & ((1 << rows) - 1)
+
+
+@numba.njit(cache=True, parallel=True)
+def _eval_lanes(opcodes, lefts, rights, out):
+    """Evaluate instructions from `_compile_ast` over 64 rows per lane.
+
+    Lane `l` holds rows `64l` to `64l+63`, so variables below the sixth
+    have a fixed pattern within every lane and the others are constant
+    across each lane. Lanes are split into tiles evaluated in parallel,
+    and each instruction is applied across a whole tile at once.
+    """
+    ones = ~np.uint64(0)
+    zero = np.uint64(0)
+    tiles = (out.shape[0] + _LANE_TILE - 1) // _LANE_TILE
+    for tile in numba.prange(tiles):
+        start = tile * _LANE_TILE
+        stop = min(start + _LANE_TILE, out.shape[0])
+        values = np.empty((opcodes.shape[0], stop - start), dtype=np.uint64)
+        for k in range(opcodes.shape[0]):
+            op = opcodes[k]
+            if op == _OP_VAR:
+                i = lefts[k]
+                for lane in range(start, stop):
+                    if i < 6:
+                        values[k, lane - start] = _LANE_PATTERNS[i]
+                    elif (lane >> (i - 6)) & 1:
+                        values[k, lane - start] = ones
+                    else:
+                        values[k, lane - start] = zero
+            elif op == _OP_NOT:
+                values[k] = ~values[lefts[k]]
+            elif op == _OP_AND:
+                values[k] = values[lefts[k]] & values[rights[k]]
+            elif op == _OP_OR:
+                values[k] = values[lefts[k]] | values[rights[k]]
+            elif op == _OP_IMP:
+                values[k] = ~values[lefts[k]] | values[rights[k]]
+            elif op == _OP_TRUE:
+                values[k] = ones
+            else:
+                values[k] = zero
+        out[start:stop] = values[opcodes.shape[0] - 1]
@@ -1,14 +1,37 @@
-import copy
 import enum
+import functools
+import pickle
+import re
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, TypeVar, Union
+from operator import attrgetter
+from types import GeneratorType
+from typing import Any, Dict, Generator, Iterator, List, Tuple, TypeVar, Union
+from weakref import WeakValueDictionary
+
+import pycosat
 
 Expr = TypeVar("Expr")
 
 
+class _Node:
+    """Base of the slotted, frozen IR classes.
+
+    Subclasses list exactly their fields in `__slots__`, so instances carry no
+    `__dict__`. Frozen dataclasses cannot restore slots by assignment when
+    unpickled, so nodes are pickled by their constructor arguments instead.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def __reduce__(self) -> Tuple[type, Tuple[Any, ...]]:
+        return type(self), tuple(map(self.__getattribute__, self.__slots__))
+
+
 @dataclass(frozen=True)
-class Variable:
+class Variable(_Node):
+    __slots__ = ("identifier",)
     identifier: str
 
 
@@ -21,37 +44,147 @@ class Token(enum.Enum):
     LEFT_PAREN = "("
 
 
-@dataclass
-class Conjunction:
+_CHAR_TO_TOKEN = {token.value: token for token in Token}
+# Left parentheses rank below every operator so they stop operators from
+# being popped without a separate check.
+_PRECEDENCE = {
+    Token.CONJUNCTION: 30,
+    Token.DISJUNCTION: 20,
+    Token.IMPLICATION: 10,
+    Token.NEGATION: 40,
+    Token.LEFT_PAREN: 0,
+}
+# The variable group also matches numeric characters such as "²" which
+# `str.isalpha` rejects, so `tokenise` filters it.
+_TOKEN_RE = re.compile(
+    r"([^\W\d_])|([" + "".join(re.escape(token.value) for token in Token) + "])"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _make_var(identifier: str) -> Variable:
+    """Return the shared `Variable` instance for an identifier."""
+    return Variable(identifier)
+
+
+@dataclass(frozen=True)
+class Conjunction(_Node):
+    __slots__ = ("lhs", "rhs")
     lhs: Expr
     rhs: Expr
 
 
-@dataclass
-class Disjunction:
+@dataclass(frozen=True)
+class Disjunction(_Node):
+    __slots__ = ("lhs", "rhs")
     lhs: Expr
     rhs: Expr
 
 
-@dataclass
-class Implication:
+@dataclass(frozen=True)
+class Implication(_Node):
+    __slots__ = ("conclusion", "premise")
     conclusion: Variable
     premise: Expr
 
 
-@dataclass
-class Negation:
+@dataclass(frozen=True)
+class Negation(_Node):
+    __slots__ = ("operand",)
     operand: Expr
 
 
-@dataclass
-class Parentheses:
+@dataclass(frozen=True)
+class NAryConjunction(_Node):
+    __slots__ = ("operands",)
+    operands: Tuple[Expr, ...]
+
+
+@dataclass(frozen=True)
+class NAryDisjunction(_Node):
+    __slots__ = ("operands",)
+    operands: Tuple[Expr, ...]
+
+
+@dataclass(frozen=True)
+class Parentheses(_Node):
+    __slots__ = ("expr",)
     expr: Expr
 
 
-Expr = Union[Variable, Conjunction, Disjunction, Implication, Negation, Expr]
+Expr = Union[
+    Variable,
+    Conjunction,
+    Disjunction,
+    Implication,
+    Negation,
+    NAryConjunction,
+    NAryDisjunction,
+    Expr,
+]
 Mapping = Dict[Variable, bool]
 
+TRUTH_TABLE_LIMIT = 20
+JIT_MIN_VARIABLES = 16
+
+_intern = WeakValueDictionary()
+
+
+def _intern_node(cls: type, *args: Expr) -> Expr:
+    """Construct a node, reusing an existing structurally identical node.
+
+    Operands are expected to be interned already so they are keyed by
+    identity. The tokeniser shares one instance per variable (see
+    `_make_var`). A node keeps its operands alive, so their ids cannot be
+    reused while its entry exists.
+
+    Args:
+        cls: Node type to construct.
+        args: Operands of the node.
+
+    Returns:
+        Canonical instance of `cls(*args)`.
+    """
+    key = (cls, *map(id, args))
+    if (node := _intern.get(key)) is None:
+        node = _intern[key] = cls(*args)
+    return node
+
+
+def _trampoline(step: Any) -> Any:
+    """Run a generator based traversal without recursing on the call stack.
+
+    Handlers for compound nodes are generators which yield the step for each
+    subexpression they depend on and are resumed with its result. Suspended
+    handlers are kept on an explicit stack, so the depth of an expression is
+    not bounded by the recursion limit. Any yielded value which is not a
+    generator is an immediate result and is sent straight back.
+
+    Args:
+        step: Generator of the root handler, or its result.
+
+    Returns:
+        Result of the root handler.
+    """
+    if not isinstance(step, GeneratorType):
+        return step
+
+    stack = [step]
+    value = None
+    while stack:
+        try:
+            step = stack[-1].send(value)
+        except StopIteration as stop:
+            stack.pop()
+            value = stop.value
+            continue
+        if isinstance(step, GeneratorType):
+            stack.append(step)
+            value = None
+        else:
+            value = step
+    return value
+
 
 class Parser:
     """Parser to transform propositional logic statements to IR.
@@ -62,12 +195,7 @@ class Parser:
 
     def __init__(self, proposition: str):
         self.proposition = proposition
-        self.precedence = {
-            Token.CONJUNCTION: 30,
-            Token.DISJUNCTION: 20,
-            Token.IMPLICATION: 10,
-            Token.NEGATION: 40,
-        }
+        self.precedence = _PRECEDENCE
 
     def parse(self) -> Expr:
         """Transform proposition into IR.
@@ -84,23 +212,18 @@ class Parser:
     def tokenise(self) -> List[Token]:
         """Tokenise proposition.
 
-        Interpret each valid char as a token and ignore invalid chars.
+        Interpret each valid char as a token and ignore invalid chars. Letters
+        are variables, and matching is done in a single pass by `_TOKEN_RE`.
+        Each occurrence of a letter yields the same `Variable` instance.
 
         Returns:
             Valid tokens found within proposition.
         """
-
-        def predicate(char: str) -> bool:
-            return char.isalpha() or char in set(token.value for token in Token)
-
-        tokens = []
-        for char in filter(predicate, self.proposition):
-            try:
-                token = Token(char)
-            except ValueError:
-                token = Variable(identifier=char)
-            tokens.append(token)
-        return tokens
+        return [
+            _CHAR_TO_TOKEN[token] if token else _make_var(char)
+            for char, token in _TOKEN_RE.findall(self.proposition)
+            if token or char.isalpha()
+        ]
 
     def _parse_internal(self, tokens: List[Token]) -> Expr:
         """Parse tokens into IR.
@@ -123,11 +246,12 @@ class Parser:
             return top
 
         handlers = {
-            Token.CONJUNCTION: lambda v: Conjunction(v.pop(), v.pop()),
-            Token.DISJUNCTION: lambda v: Disjunction(v.pop(), v.pop()),
-            Token.IMPLICATION: lambda v: Implication(v.pop(), v.pop()),
-            Token.NEGATION: lambda v: Negation(v.pop()),
+            Token.CONJUNCTION: lambda v: _intern_node(Conjunction, v.pop(), v.pop()),
+            Token.DISJUNCTION: lambda v: _intern_node(Disjunction, v.pop(), v.pop()),
+            Token.IMPLICATION: lambda v: _intern_node(Implication, v.pop(), v.pop()),
+            Token.NEGATION: lambda v: _intern_node(Negation, v.pop()),
         }
+        precedence = self.precedence
         operators = []
         values = []
 
@@ -142,13 +266,9 @@ class Parser:
                     operators.pop()
                 operators.pop()
             else:
-                while (
-                    (top := peek(operators)) is not None
-                    and top not in [Token.LEFT_PAREN, Token.RIGHT_PAREN]
-                    and self.precedence[top] > self.precedence[token]
-                ):
-                    values.append(handlers[top](values))
-                    operators.pop()
+                token_precedence = precedence[token]
+                while operators and precedence[operators[-1]] > token_precedence:
+                    values.append(handlers[operators.pop()](values))
                 operators.append(token)
 
         while (top := peek(operators)) is not None:
@@ -158,42 +278,65 @@ class Parser:
         return peek(values)
 
 
-def solve(proposition: str, mappings: List[Mapping] = None) -> List[Mapping]:
+def solve(
+    proposition: str, mappings: List[Mapping] = None, processes: int = None
+) -> List[Mapping]:
     """Find all solutions for given proposition.
 
     Attempt to find solutions for the proposition after parsing and
-    simplification.
+    simplification. The prepared expression is cached per proposition (see
+    `_prepare`), so repeated calls only repeat the search.
 
     Args:
         proposition: Propositional logic statement.
         mappings: List of initial variable assignments.
+        processes: Number of worker processes to solve the operands of a top
+            level disjunction in. By default everything is solved in this
+            process. A new pool is started per call, so this only pays off
+            when each operand is expensive to solve.
 
     Returns:
         List of possible variable mappings for the given proposition to
         evaluate to T.
 
+    Raises:
+        ValueError: If `processes` is not positive.
+
     Examples:
         >>> solve("(P∧¬P)∨Q")
         [{Variable(identifier='Q'): True}]
     """
-    parser = Parser(proposition)
-    expr = parser.parse()
+    expr = _prepare(proposition)
     if expr is None:
         return expr
 
-    simplified = simplify(expr)
-
     if mappings is None:
         mappings = [{}]
 
-    return _solve_expr(expr, mappings, True)
+    return _solve_expr(expr, mappings, True, processes)
+
 
+@functools.lru_cache(maxsize=1024)
+def _prepare(proposition: str) -> Expr:
+    """Parse and simplify a proposition into the form `_solve_expr` expects.
 
-def solve_expr(expr: Expr, mappings: List[Mapping] = None) -> List[Mapping]:
+    Nodes are immutable, so cached expressions can be shared between calls.
+    """
+    expr = Parser(proposition).parse()
+    if expr is None:
+        return expr
+    return flatten(to_nnf(peephole(expr)))
+
+
+def solve_expr(
+    expr: Expr, mappings: List[Mapping] = None, processes: int = None
+) -> List[Mapping]:
     """Find all solutions for given IR expression.
 
     Args:
         expr: Expression to solve.
+        mappings: List of initial variable assignments.
+        processes: Number of worker processes, see `solve`.
 
     Returns:
         List of possible variable mappings for the given expression to
@@ -202,82 +345,949 @@ def solve_expr(expr: Expr, mappings: List[Mapping] = None) -> List[Mapping]:
     if mappings is None:
         mappings = [{}]
 
-    return _solve_expr(expr, mappings, True)
+    return _solve_expr(flatten(to_nnf(expr)), mappings, True, processes)
 
 
-def _solve_expr(expr: Expr, mappings: List[Mapping], constraint: bool) -> List[Mapping]:
+def _solve_expr(
+    expr: Expr, mappings: List[Mapping], constraint: bool, processes: int = None
+) -> List[Mapping]:
     """Determine all evaluation trees to evaluate to desired constraint.
 
+    The expression must be in negation normal form (see `to_nnf`) and
+    flattened (see `flatten`), so conjunctions and disjunctions are n-ary.
+    Each node is dispatched on its type to a handler in `_SOLVE_DISPATCH` and
+    handlers of compound nodes are driven by `_trampoline`.
+
     For each initial variable mapping we attempt to coerce the current
     expression into the given constraint. If the expression is a variable
     which we have already assigned a different value to what is required,
     we reject the variable mapping. Otherwise, we denote the value of the
     variable in the current mapping.
 
-    Conjunction requires both operands to evaluate to the same outcome. We
-    attempt to coerce both sides, if this is impossible we reject the current
-    variable mapping.
+    Conjunction requires all operands to evaluate to the same outcome. We
+    attempt to coerce each operand, if this is impossible we reject the
+    current variable mapping.
 
     Disjunction only requires one operand to evaluate to the constraint.
-    Consequently, there are potentially two possible variable mappings per
-    disjunction (with each mapping a different state where the expression
-    holds). These cases stack, for `n` nested disjunctions, there will be
-    `2^(n-1)` mappings. A copy of the current mapping is created so both
-    operands are given a unique context. We reject the mapping of an operand
-    if it fails to coerce.
-
-    Negation requires its operand to evaluate to the opposite of the current
+    Consequently, there are potentially as many variable mappings as operands
+    per disjunction (with each mapping a different state where the expression
+    holds). These cases stack across nested disjunctions. A shallow copy of
+    the current mapping is created so each operand is given a unique context.
+    Keys and values are immutable, so they can be shared between copies. We
+    reject the mapping of an operand if it fails to coerce.
+
+    Negation requires its variable to evaluate to the opposite of the current
     constraint. If this is impossible, we reject the mapping.
 
-    Implication attempts to satisfy the truth table.
+    Different branches can reach the same mapping, so duplicates are removed
+    from the result, keeping the first occurrence of each.
 
-    ===== ===== =====
-      P     Q    P→Q
-    ===== ===== =====
-      T     T     T
-      T     F     F
-      F     T     T
-      F     F     T
-    ===== ===== =====
+    The operands of a top level disjunction are independent, so when
+    `processes` is given they are solved in that many worker processes (see
+    `_solve_parallel`).
 
     Args:
         expr: Expression to solve.
         mappings: List of variable mappings.
         constraint: Target value for expression to evaluate to.
+        processes: Number of worker processes, or None to solve in this
+            process.
 
     Returns:
         List of possible variable mappings for dependent expressions to evaluate
         to `constraint`.
+
+    Raises:
+        ValueError: If `processes` is not positive.
     """
-    if isinstance(expr, bool):
-        return mappings if expr == constraint else []
+    if processes is not None and processes <= 0:
+        raise ValueError("processes must be greater than 0")
+    if processes is not None and processes > 1 and isinstance(expr, NAryDisjunction):
+        return _dedup_mappings(_solve_parallel(expr, mappings, constraint, processes))
+    return _dedup_mappings(_trampoline(_solve_step(expr, mappings, constraint)))
+
 
+def _dedup_mappings(mappings: List[Mapping]) -> List[Mapping]:
+    """Remove repeated mappings, keeping the first occurrence of each."""
+    seen = set()
     new_mappings = []
     for mapping in mappings:
+        key = frozenset(mapping.items())
+        if key not in seen:
+            seen.add(key)
+            new_mappings.append(mapping)
+    return new_mappings
+
+
+def _solve_parallel(
+    expr: NAryDisjunction, mappings: List[Mapping], constraint: bool, processes: int
+) -> List[Mapping]:
+    """Solve the operands of a disjunction in worker processes.
+
+    The operands are split into contiguous groups and each group is solved
+    for each mapping by one task, so results keep the order of `_solve_expr`.
+    Tasks are pickled up front so expressions too deep to pickle, or which
+    make a single task, fall back to solving in this process.
+    """
+    operands = expr.operands
+    size = -(-len(operands) // (4 * processes))
+    try:
+        tasks = [
+            pickle.dumps((operands[i : i + size], mapping, constraint))
+            for mapping in mappings
+            for i in range(0, len(operands), size)
+        ]
+    except RecursionError:
+        tasks = []
+    if len(tasks) <= 1:
+        return _trampoline(_solve_step(expr, mappings, constraint))
+
+    new_mappings = []
+    with ProcessPoolExecutor(processes) as executor:
+        for result in executor.map(_solve_branch, tasks):
+            new_mappings.extend(result)
+    return new_mappings
+
+
+def _solve_branch(task: bytes) -> List[Mapping]:
+    """Solve a pickled `(operands, mapping, constraint)` task in a worker."""
+    operands, mapping, constraint = pickle.loads(task)
+    new_mappings = []
+    for operand in operands:
+        new_mappings.extend(
+            _trampoline(_solve_step(operand, [dict(mapping)], constraint))
+        )
+    return new_mappings
+
+
+def _solve_step(expr: Expr, mappings: List[Mapping], constraint: bool) -> Any:
+    """Dispatch a node to its handler, see `_trampoline`."""
+    return _SOLVE_DISPATCH[type(expr)](expr, mappings, constraint)
+
+
+def _solve_constant(
+    expr: bool, mappings: List[Mapping], constraint: bool
+) -> List[Mapping]:
+    """Keep all mappings if the constant matches the constraint."""
+    return mappings if expr == constraint else []
+
+
+def _solve_variable(
+    expr: Variable, mappings: List[Mapping], constraint: bool
+) -> List[Mapping]:
+    """Assign the constraint to a variable in every consistent mapping."""
+    new_mappings = []
+    for mapping in mappings:
+        if mapping.get(expr, constraint) != constraint:
+            continue
+        mapping[expr] = constraint
+        new_mappings.append(mapping)
+    return new_mappings
+
+
+def _solve_nary_disjunction(
+    expr: NAryDisjunction, mappings: List[Mapping], constraint: bool
+) -> Generator[Any, List[Mapping], List[Mapping]]:
+    """Branch every mapping into one context per operand."""
+    *operands, last = expr.operands
+    new_mappings = []
+    for mapping in mappings:
+        for operand in operands:
+            new_mappings.extend(
+                (yield _solve_step(operand, [dict(mapping)], constraint))
+            )
+        new_mappings.extend((yield _solve_step(last, [mapping], constraint)))
+    return new_mappings
+
+
+def _solve_nary_conjunction(
+    expr: NAryConjunction, mappings: List[Mapping], constraint: bool
+) -> Generator[Any, List[Mapping], List[Mapping]]:
+    """Coerce every operand, threading the mappings from one into the next."""
+    for operand in expr.operands:
+        mappings = yield _solve_step(operand, mappings, constraint)
+    return mappings
+
+
+def _solve_negation(
+    expr: Negation, mappings: List[Mapping], constraint: bool
+) -> List[Mapping]:
+    """Coerce the negated variable into the opposite constraint."""
+    return _solve_variable(expr.operand, mappings, not constraint)
+
+
+_SOLVE_DISPATCH = {
+    bool: _solve_constant,
+    Variable: _solve_variable,
+    NAryDisjunction: _solve_nary_disjunction,
+    NAryConjunction: _solve_nary_conjunction,
+    Negation: _solve_negation,
+}
+
+
+def models(proposition: str, mappings: List[Mapping] = None) -> List[Mapping]:
+    """Find all models for given proposition.
+
+    Unlike `solve`, which returns the partial mappings discovered while
+    walking the expression, every model assigns a value to every variable
+    of the proposition.
+
+    Args:
+        proposition: Propositional logic statement.
+        mappings: List of initial variable assignments.
+
+    Returns:
+        List of complete variable mappings for the given proposition to
+        evaluate to T.
+
+    Examples:
+        >>> models("P∧¬Q")
+        [{Variable(identifier='Q'): False, Variable(identifier='P'): True}]
+    """
+    parser = Parser(proposition)
+    expr = parser.parse()
+    if expr is None:
+        return expr
+
+    return models_expr(expr, mappings)
+
+
+def models_expr(expr: Expr, mappings: List[Mapping] = None) -> List[Mapping]:
+    """Find all models for given IR expression.
+
+    Expressions with at most `TRUTH_TABLE_LIMIT` variables are evaluated
+    over their whole truth table at once (see `_truth_table_models`).
+
+    Otherwise the expression is converted into CNF and handed to PicoSAT.
+    After each model is found it is excluded by a blocking clause over the
+    variables of the expression and the clauses are solved again.
+
+    Args:
+        expr: Expression to solve.
+        mappings: List of initial variable assignments.
+
+    Returns:
+        List of complete variable mappings for the given expression to
+        evaluate to T.
+    """
+    if mappings is None:
+        mappings = [{}]
+
+    variables = _variables(expr)
+    if len(variables) <= TRUTH_TABLE_LIMIT:
+        return _truth_table_models(expr, variables, mappings)
+
+    clauses, var_id = to_cnf(flatten(expr))
+    new_mappings = []
+    for mapping in mappings:
+        new_mappings.extend(_iter_models(clauses, var_id, mapping))
+    return new_mappings
+
+
+def _variables(expr: Expr) -> List[Variable]:
+    """Collect the distinct variables of an expression.
+
+    Args:
+        expr: Expression to search.
+
+    Returns:
+        Variables in order of first occurrence.
+    """
+    variables = {}
+    visited = set()
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
         if isinstance(expr, Variable):
-            if (val := mapping.get(expr, constraint)) != constraint:
-                continue
-            mapping[expr] = constraint
-            mapping = [mapping]
+            variables[expr] = None
+        elif isinstance(expr, bool) or id(expr) in visited:
+            continue
+        else:
+            visited.add(id(expr))
+            stack.extend(reversed(_OPERANDS[type(expr)](expr)))
+    return list(variables)
+
+
+def _truth_table_models(
+    expr: Expr, variables: List[Variable], mappings: List[Mapping]
+) -> List[Mapping]:
+    """Find all models by evaluating every row of the truth table in parallel.
+
+    Each of the `2^n` assignments of `n` variables is a row, and bit `k` of
+    an integer holds the value of an expression in row `k`. Variable `i` is
+    true in the rows where bit `i` of `k` is set, so its column repeats
+    `2^i` zeros followed by `2^i` ones. Evaluating a node is then a single
+    bitwise operation on the columns of its operands, and the set bits of
+    the root are its models. With the `jit` extra installed, expressions of
+    at least `JIT_MIN_VARIABLES` variables are evaluated by the Numba kernel
+    in `_jit` instead, which is only imported on first use.
 
-        elif isinstance(expr, Disjunction):
-            mapping_copy = copy.deepcopy(mapping)
-            new_mappings.extend(_solve_expr(expr.lhs, [mapping_copy], constraint))
-            mapping = _solve_expr(expr.rhs, [mapping], constraint)
+    Args:
+        expr: Expression to solve.
+        variables: Distinct variables of the expression.
+        mappings: List of initial variable assignments.
 
-        elif isinstance(expr, Conjunction):
-            m = _solve_expr(expr.lhs, [mapping], constraint)
-            mapping = _solve_expr(expr.rhs, m, constraint)
+    Returns:
+        List of complete variable mappings for the given expression to
+        evaluate to T.
+    """
+    rows = 1 << len(variables)
+    mask = (1 << rows) - 1
+    index = {var: i for i, var in enumerate(variables)}
 
-        elif isinstance(expr, Negation):
-            mapping = _solve_expr(expr.operand, [mapping], not constraint)
+    if len(variables) >= JIT_MIN_VARIABLES and (jit := _load_jit()) is not None:
+        satisfied = jit.truth_table(*_compile_ast(expr, variables), len(variables))
+    else:
+        satisfied = _truth_table_bits(expr, variables)
 
+    new_mappings = []
+    for mapping in mappings:
+        rows_satisfied = satisfied
+        for var, val in mapping.items():
+            if (i := index.get(var)) is not None:
+                column = _truth_table_column(i, rows)
+                rows_satisfied &= column if val else mask ^ column
+
+        bits = bin(rows_satisfied)[:1:-1]
+        row = bits.find("1")
+        while row != -1:
+            model = dict(mapping)
+            for i, var in enumerate(variables):
+                model[var] = bool(row >> i & 1)
+            new_mappings.append(model)
+            row = bits.find("1", row + 1)
+    return new_mappings
+
+
+def _truth_table_column(i: int, rows: int) -> int:
+    """Build the truth table column of the `i`-th variable."""
+    column = ((1 << (1 << i)) - 1) << (1 << i)
+    width = 2 << i
+    while width < rows:
+        column |= column << width
+        width <<= 1
+    return column
+
+
+def _truth_table_bits(expr: Expr, variables: List[Variable]) -> int:
+    """Evaluate an expression over its truth table using Python integers.
+
+    Args:
+        expr: Expression to evaluate.
+        variables: Distinct variables of the expression.
+
+    Returns:
+        Integer with bit `k` set if row `k` satisfies the expression.
+    """
+    rows = 1 << len(variables)
+    mask = (1 << rows) - 1
+    columns = {var: _truth_table_column(i, rows) for i, var in enumerate(variables)}
+    values = {}
+
+    def evaluate(expr: Expr) -> Any:
+        if isinstance(expr, bool):
+            return mask if expr else 0
+        if isinstance(expr, Variable):
+            return columns[expr]
+        if (value := values.get(id(expr))) is None:
+            return evaluate_compound(expr)
+        return value
+
+    def evaluate_compound(expr: Expr) -> Generator[Any, int, int]:
+        if isinstance(expr, Negation):
+            value = mask ^ (yield evaluate(expr.operand))
+        elif isinstance(expr, Conjunction):
+            value = (yield evaluate(expr.lhs)) & (yield evaluate(expr.rhs))
+        elif isinstance(expr, Disjunction):
+            value = (yield evaluate(expr.lhs)) | (yield evaluate(expr.rhs))
+        elif isinstance(expr, NAryConjunction):
+            value = mask
+            for operand in expr.operands:
+                value &= yield evaluate(operand)
+        elif isinstance(expr, NAryDisjunction):
+            value = 0
+            for operand in expr.operands:
+                value |= yield evaluate(operand)
         elif isinstance(expr, Implication):
-            m = _solve_expr(expr.conclusion, [mapping], constraint)
-            mapping = _solve_expr(expr.premise, m, not constraint)
+            premise = yield evaluate(expr.premise)
+            value = (mask ^ premise) | (yield evaluate(expr.conclusion))
+        values[id(expr)] = value
+        return value
 
-        new_mappings.extend(mapping)
-    return new_mappings
+    return _trampoline(evaluate(expr))
+
+
+_OP_VAR, _OP_NOT, _OP_AND, _OP_OR, _OP_IMP, _OP_TRUE, _OP_FALSE = range(7)
+
+_OPCODES = {
+    Negation: _OP_NOT,
+    Conjunction: _OP_AND,
+    Disjunction: _OP_OR,
+    Implication: _OP_IMP,
+    NAryConjunction: _OP_AND,
+    NAryDisjunction: _OP_OR,
+}
+
+
+def _compile_ast(
+    expr: Expr, variables: List[Variable]
+) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+    """Flatten an expression into arrays of instructions.
+
+    Instruction `k` applies `opcodes[k]` to the results of instructions
+    `lefts[k]` and `rights[k]`, which always precede it, and the root is the
+    last instruction. `_OP_VAR` instructions instead hold the index of their
+    variable in `lefts`. N-ary nodes are emitted as a chain of binary
+    instructions. Shared subexpressions are emitted once.
+
+    Args:
+        expr: Expression to flatten.
+        variables: Distinct variables of the expression.
+
+    Returns:
+        Opcode, left operand and right operand arrays.
+    """
+    var_index = {var: i for i, var in enumerate(variables)}
+    instructions = []
+    index = {}
+    stack = [(expr, False)]
+    while stack:
+        expr, expanded = stack.pop()
+        if id(expr) in index:
+            continue
+        if isinstance(expr, bool):
+            instructions.append((_OP_TRUE if expr else _OP_FALSE, 0, 0))
+        elif isinstance(expr, Variable):
+            instructions.append((_OP_VAR, var_index[expr], 0))
+        elif not expanded:
+            stack.append((expr, True))
+            stack.extend(
+                (child, False) for child in reversed(_OPERANDS[type(expr)](expr))
+            )
+            continue
+        else:
+            first, *operands = [
+                index[id(child)] for child in _OPERANDS[type(expr)](expr)
+            ]
+            for operand in operands or [first]:
+                instructions.append((_OPCODES[type(expr)], first, operand))
+                first = len(instructions) - 1
+        index[id(expr)] = len(instructions) - 1
+
+    opcodes, lefts, rights = zip(*instructions)
+    return opcodes, lefts, rights
+
+
+@functools.lru_cache(maxsize=None)
+def _load_jit() -> Any:
+    """Import the Numba truth table kernel on first use.
+
+    Returns:
+        The `_jit` module, or None if the `jit` extra is not installed.
+    """
+    try:
+        from . import _jit
+    except ImportError:
+        return None
+    return _jit
+
+
+def _iter_models(
+    clauses: List[List[int]], var_id: Dict[Variable, int], mapping: Mapping
+) -> Iterator[Mapping]:
+    """Enumerate models of CNF clauses extending an initial mapping.
+
+    Variables of the initial mapping are asserted as unit clauses. Variables
+    absent from the clauses cannot affect satisfiability and are copied into
+    each model unchanged. The clauses are then reduced by `unit_propagate`
+    and variables it forces are shared by every model. Blocking clauses only
+    mention the remaining `var_id` literals, auxiliary literals are left free
+    so each model is found exactly once.
+
+    Args:
+        clauses: CNF clauses as produced by `to_cnf`.
+        var_id: Table of variables to their literal within `clauses`.
+        mapping: Initial variable assignment.
+
+    Yields:
+        Complete variable mappings satisfying the clauses.
+    """
+    clauses, forced = unit_propagate(
+        clauses
+        + [
+            [var_id[var] if val else -var_id[var]]
+            for var, val in mapping.items()
+            if var in var_id
+        ]
+    )
+    if [] in clauses:
+        return
+
+    mapping = dict(mapping)
+    free = {}
+    for var, lit in var_id.items():
+        if lit in forced:
+            mapping[var] = forced[lit]
+        else:
+            free[var] = lit
+
+    n_vars = max(var_id.values(), default=0)
+    while (solution := pycosat.solve(clauses, vars=n_vars)) != "UNSAT":
+        model = dict(mapping)
+        blocking = []
+        for var, lit in free.items():
+            model[var] = solution[lit - 1] > 0
+            blocking.append(-solution[lit - 1])
+        yield model
+        if not blocking:
+            return
+        clauses.append(blocking)
+
+
+def unit_propagate(clauses: List[List[int]]) -> Tuple[List[List[int]], Dict[int, bool]]:
+    """Assign the literals of unit clauses until none remain.
+
+    Every literal of a unit clause must hold, so its variable is assigned,
+    clauses containing it are removed and its negation is removed from the
+    others. Clauses left with a single literal are propagated in turn. Each
+    clause is tracked by the number of its literals falsified so far, so
+    assigning a variable only visits the clauses it occurs in.
+
+    Pure literals are not eliminated: fixing them preserves satisfiability
+    but would discard models.
+
+    Args:
+        clauses: CNF clauses as lists of DIMACS literals.
+
+    Returns:
+        The remaining clauses and the value forced for each assigned
+        variable. If the clauses are unsatisfiable the remaining clauses are
+        `[[]]`.
+
+    Examples:
+        >>> unit_propagate([[1], [-1, 2], [-2, 3, 4]])
+        ([[3, 4]], {1: True, 2: True})
+    """
+    occurrences = {}
+    for i, clause in enumerate(clauses):
+        for lit in clause:
+            occurrences.setdefault(lit, []).append(i)
+
+    forced = {}
+    satisfied = [False] * len(clauses)
+    falsified = [0] * len(clauses)
+    units = [clause[0] for clause in clauses if len(clause) == 1]
+    if [] in clauses:
+        return [[]], forced
+
+    while units:
+        lit = units.pop()
+        if (val := forced.get(abs(lit))) is not None:
+            if val != (lit > 0):
+                return [[]], forced
+            continue
+        forced[abs(lit)] = lit > 0
+
+        for i in occurrences.get(lit, ()):
+            satisfied[i] = True
+        for i in occurrences.get(-lit, ()):
+            if satisfied[i]:
+                continue
+            falsified[i] += 1
+            remaining = len(clauses[i]) - falsified[i]
+            if remaining == 0:
+                return [[]], forced
+            if remaining == 1:
+                units.extend(other for other in clauses[i] if abs(other) not in forced)
+
+    return [
+        [lit for lit in clause if abs(lit) not in forced]
+        for i, clause in enumerate(clauses)
+        if not satisfied[i]
+    ], forced
+
+
+def to_cnf(expr: Expr) -> Tuple[List[List[int]], Dict[Variable, int]]:
+    """Transform IR into conjunctive normal form.
+
+    The Plaisted-Greenbaum transformation assigns every subexpression a fresh
+    literal `a` and emits clauses for the single direction of `a↔sub` needed
+    by the polarity the subexpression occurs in. Positive occurrences only
+    require `a→sub`, e.g. `a→(b∧c)` becomes `(¬a∨b)∧(¬a∨c)`, and negative
+    occurrences only require `sub→a`. N-ary nodes (see `flatten`) encode a
+    whole chain with one literal, e.g. a positive `x1∨…∨xk` is the single
+    clause `¬a∨x1∨…∨xk`. Negations flip the polarity of their
+    operand and need no literal of their own. The result is equisatisfiable
+    with the expression and grows linearly with its size. Each model of the
+    clauses restricted to `var_id` is a model of the expression.
+
+    Every node and polarity is encoded once and repeated operand literals
+    are merged, so no clause is emitted twice.
+
+    Args:
+        expr: Expression to transform.
+
+    Returns:
+        Clauses as lists of DIMACS literals and a table mapping each variable
+        to its literal.
+
+    Examples:
+        >>> to_cnf(Parser("P∧Q").parse())
+        ([[-1, 2], [-1, 3], [1]], {Variable(identifier='Q'): 2, Variable(identifier='P'): 3})
+    """
+    clauses = []
+    var_id = {}
+    node_id = {}
+    encoded = set()
+
+    def fresh() -> int:
+        return len(node_id) + len(var_id) + 1
+
+    def tseitin_pg(expr: Expr, polarity: int = 1) -> Any:
+        if isinstance(expr, bool):
+            if (lit := node_id.get(True)) is None:
+                lit = node_id[True] = fresh()
+                clauses.append([lit])
+            return lit if expr else -lit
+        if isinstance(expr, Variable):
+            if (lit := var_id.get(expr)) is None:
+                lit = var_id[expr] = fresh()
+            return lit
+        if isinstance(expr, Negation):
+            return encode_negation(expr, polarity)
+
+        if (lit := node_id.get(id(expr))) is None:
+            lit = node_id[id(expr)] = fresh()
+        if (id(expr), polarity) in encoded:
+            return lit
+        return encode(expr, lit, polarity)
+
+    def encode_negation(expr: Negation, polarity: int) -> Generator[Any, int, int]:
+        return -(yield tseitin_pg(expr.operand, -polarity))
+
+    def encode(expr: Expr, lit: int, polarity: int) -> Generator[Any, int, int]:
+        encoded.add((id(expr), polarity))
+        if isinstance(expr, Implication):
+            a = yield tseitin_pg(expr.premise, -polarity)
+            b = yield tseitin_pg(expr.conclusion, polarity)
+            if polarity > 0:
+                clauses.append([-lit, -a, b])
+            else:
+                clauses.extend([[lit, a], [lit, -b]])
+            return lit
+
+        lits = []
+        for operand in _OPERANDS[type(expr)](expr):
+            lits.append((yield tseitin_pg(operand, polarity)))
+        lits = dict.fromkeys(lits)
+        if isinstance(expr, (Conjunction, NAryConjunction)):
+            if polarity > 0:
+                clauses.extend([-lit, a] for a in lits)
+            else:
+                clauses.append([lit, *(-a for a in lits)])
+        elif polarity > 0:
+            clauses.append([-lit, *lits])
+        else:
+            clauses.extend([lit, -a] for a in lits)
+        return lit
+
+    root = _trampoline(tseitin_pg(expr))
+    if root != node_id.get(True):
+        clauses.append([root])
+    return clauses, var_id
+
+
+def to_nnf(expr: Expr) -> Expr:
+    """Transform IR into negation normal form.
+
+    Negations are pushed down to variables using De Morgan's laws and
+    implications are rewritten as `¬P∨Q`. Subexpressions without negations
+    or implications are reused as is.
+
+    Args:
+        expr: Expression to transform.
+
+    Returns:
+        Equivalent expression built from variables, negated variables,
+        conjunctions and disjunctions.
+
+    Examples:
+        >>> to_nnf(Parser("¬(P∧Q)").parse())
+        Disjunction(lhs=Negation(operand=Variable(identifier='Q')), rhs=Negation(operand=Variable(identifier='P')))
+    """
+
+    def push(expr: Expr, negated: bool) -> Any:
+        if isinstance(expr, bool):
+            return expr != negated
+        if isinstance(expr, Variable):
+            return Negation(expr) if negated else expr
+        if isinstance(expr, Negation) and isinstance(expr.operand, Variable):
+            return expr.operand if negated else expr
+        return push_compound(expr, negated)
+
+    def push_compound(expr: Expr, negated: bool) -> Generator[Any, Expr, Expr]:
+        if isinstance(expr, Negation):
+            return (yield push(expr.operand, not negated))
+        if isinstance(expr, Implication):
+            conclusion = yield push(expr.conclusion, negated)
+            premise = yield push(expr.premise, not negated)
+            return (Conjunction if negated else Disjunction)(conclusion, premise)
+        if isinstance(expr, (NAryConjunction, NAryDisjunction)):
+            return (yield push_nary(expr, negated))
+
+        lhs = yield push(expr.lhs, negated)
+        rhs = yield push(expr.rhs, negated)
+        if negated:
+            cls = Disjunction if isinstance(expr, Conjunction) else Conjunction
+            return cls(lhs, rhs)
+        if lhs is expr.lhs and rhs is expr.rhs:
+            return expr
+        return type(expr)(lhs, rhs)
+
+    def push_nary(expr: Expr, negated: bool) -> Generator[Any, Expr, Expr]:
+        operands = []
+        for operand in expr.operands:
+            operands.append((yield push(operand, negated)))
+        if negated:
+            cls = (
+                NAryDisjunction
+                if isinstance(expr, NAryConjunction)
+                else NAryConjunction
+            )
+            return cls(tuple(operands))
+        if all(a is b for a, b in zip(operands, expr.operands)):
+            return expr
+        return type(expr)(tuple(operands))
+
+    return _trampoline(push(expr, False))
+
+
+def flatten(expr: Expr) -> Expr:
+    """Collapse chains of conjunctions and disjunctions into n-ary nodes.
+
+    Nested operands of the same operator are merged in order, so `P∧Q∧R`
+    becomes a single `NAryConjunction` over `P`, `Q` and `R`. Every
+    conjunction and disjunction is replaced, even those with two operands.
+
+    Args:
+        expr: Expression to transform.
+
+    Returns:
+        Equivalent expression without binary conjunctions or disjunctions.
+
+    Examples:
+        >>> flatten(Parser("P∧Q∧R").parse())
+        NAryConjunction(operands=(Variable(identifier='R'), Variable(identifier='Q'), Variable(identifier='P')))
+    """
+    results = {}
+    children = {}
+    stack = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        if isinstance(node, (bool, Variable)):
+            results[id(node)] = node
+            continue
+
+        if not expanded:
+            operands = children[id(node)] = _flatten_operands(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in operands)
+            continue
+
+        operands = [results[id(child)] for child in children.pop(id(node))]
+        results[id(node)] = _FLATTEN_DISPATCH[type(node)](node, *operands)
+    return results[id(expr)]
+
+
+def _flatten_operands(expr: Expr) -> List[Expr]:
+    """Collect the operands of the maximal chain of operators headed by expr.
+
+    Only the head of a chain is flattened, so nodes inside it are walked
+    once and never built into n-ary nodes of their own.
+    """
+    if (chain := _FLATTEN_CHAINS.get(type(expr))) is None:
+        return list(_OPERANDS[type(expr)](expr))
+
+    operands = []
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        if _FLATTEN_CHAINS.get(type(node)) is chain:
+            stack.extend(reversed(_OPERANDS[type(node)](node)))
+        else:
+            operands.append(node)
+    return operands
+
+
+_FLATTEN_CHAINS = {
+    Conjunction: NAryConjunction,
+    NAryConjunction: NAryConjunction,
+    Disjunction: NAryDisjunction,
+    NAryDisjunction: NAryDisjunction,
+}
+
+_FLATTEN_DISPATCH = {
+    Negation: lambda expr, operand: (
+        expr if operand is expr.operand else Negation(operand)
+    ),
+    Implication: lambda expr, premise, conclusion: (
+        expr
+        if premise is expr.premise and conclusion is expr.conclusion
+        else Implication(conclusion, premise)
+    ),
+    Conjunction: lambda expr, *operands: NAryConjunction(operands),
+    Disjunction: lambda expr, *operands: NAryDisjunction(operands),
+    NAryConjunction: lambda expr, *operands: NAryConjunction(operands),
+    NAryDisjunction: lambda expr, *operands: NAryDisjunction(operands),
+}
+
+
+def peephole(expr: Expr) -> Expr:
+    """Apply local boolean identities to expr until it stops changing.
+
+    Double negations are removed, constants are folded and idempotent or
+    complementary operands are collapsed (e.g. `P∧P` is `P`, `P∨¬P` is T and
+    `P→P` is T). Operands are compared by identity, which hash-consing in the
+    parser makes structural, and variables are compared by value.
+
+    Args:
+        expr: Expression to simplify.
+
+    Returns:
+        Equivalent expression, which may be a constant.
+
+    Examples:
+        >>> peephole(Parser("¬¬P∧(Q∨¬Q)").parse())
+        Variable(identifier='P')
+    """
+    while (simplified := _peephole_pass(expr)) is not expr:
+        expr = simplified
+    return expr
+
+
+def _peephole_pass(expr: Expr) -> Expr:
+    """Rewrite every node of expr bottom up with `_PEEPHOLE_DISPATCH`."""
+    results = {}
+    stack = [(expr, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in results:
+            continue
+        if isinstance(node, (bool, Variable)):
+            results[id(node)] = node
+            continue
+
+        operands = _OPERANDS[type(node)](node)
+        if not expanded:
+            stack.append((node, True))
+            stack.extend((child, False) for child in operands)
+            continue
+
+        operands = [results[id(child)] for child in operands]
+        results[id(node)] = _PEEPHOLE_DISPATCH[type(node)](node, *operands)
+    return results[id(expr)]
+
+
+def _same(lhs: Expr, rhs: Expr) -> bool:
+    """Check if two operands are the same expression."""
+    return lhs is rhs or (isinstance(lhs, Variable) and lhs == rhs)
+
+
+def _complementary(lhs: Expr, rhs: Expr) -> bool:
+    """Check if one operand is the negation of the other."""
+    return (isinstance(rhs, Negation) and _same(lhs, rhs.operand)) or (
+        isinstance(lhs, Negation) and _same(lhs.operand, rhs)
+    )
+
+
+def _peephole_negation(expr: Negation, operand: Expr) -> Expr:
+    """Fold negated constants and double negations."""
+    if isinstance(operand, bool):
+        return not operand
+    if isinstance(operand, Negation):
+        return operand.operand
+    if operand is expr.operand:
+        return expr
+    return _intern_node(Negation, operand)
+
+
+def _peephole_conjunction(expr: Conjunction, lhs: Expr, rhs: Expr) -> Expr:
+    """Fold constants, `P∧P` and `P∧¬P`."""
+    if lhs is False or rhs is False or _complementary(lhs, rhs):
+        return False
+    if rhs is True or _same(lhs, rhs):
+        return lhs
+    if lhs is True:
+        return rhs
+    if lhs is expr.lhs and rhs is expr.rhs:
+        return expr
+    return _intern_node(Conjunction, lhs, rhs)
+
+
+def _peephole_disjunction(expr: Disjunction, lhs: Expr, rhs: Expr) -> Expr:
+    """Fold constants, `P∨P` and `P∨¬P`."""
+    if lhs is True or rhs is True or _complementary(lhs, rhs):
+        return True
+    if rhs is False or _same(lhs, rhs):
+        return lhs
+    if lhs is False:
+        return rhs
+    if lhs is expr.lhs and rhs is expr.rhs:
+        return expr
+    return _intern_node(Disjunction, lhs, rhs)
+
+
+def _peephole_implication(expr: Implication, premise: Expr, conclusion: Expr) -> Expr:
+    """Fold constants and `P→P`."""
+    if premise is False or conclusion is True or _same(premise, conclusion):
+        return True
+    if premise is True:
+        return conclusion
+    if conclusion is False:
+        return _peephole_negation(_intern_node(Negation, premise), premise)
+    if premise is expr.premise and conclusion is expr.conclusion:
+        return expr
+    return _intern_node(Implication, conclusion, premise)
+
+
+def _peephole_nary(expr: Expr, operands: Tuple[Expr, ...], unit: bool) -> Expr:
+    """Fold constants, repeated and complementary operands of an n-ary node."""
+    kept = {}
+    for operand in operands:
+        if operand is (not unit):
+            return not unit
+        if operand is not unit:
+            kept.setdefault(_peephole_key(operand), operand)
+    for operand in kept.values():
+        if isinstance(operand, Negation) and _peephole_key(operand.operand) in kept:
+            return not unit
+    if not kept:
+        return unit
+    if len(kept) == 1:
+        return next(iter(kept.values()))
+    operands = tuple(kept.values())
+    if len(operands) == len(expr.operands) and all(
+        a is b for a, b in zip(operands, expr.operands)
+    ):
+        return expr
+    return type(expr)(operands)
+
+
+def _peephole_key(operand: Expr) -> Any:
+    """Key operands by identity, except variables which are keyed by value."""
+    return operand if isinstance(operand, Variable) else id(operand)
+
+
+_PEEPHOLE_DISPATCH = {
+    Negation: _peephole_negation,
+    Conjunction: _peephole_conjunction,
+    Disjunction: _peephole_disjunction,
+    Implication: _peephole_implication,
+    NAryConjunction: lambda expr, *operands: _peephole_nary(expr, operands, True),
+    NAryDisjunction: lambda expr, *operands: _peephole_nary(expr, operands, False),
+}
 
 
 def simplify(expr: Expr) -> Expr:
@@ -287,6 +1297,11 @@ def simplify(expr: Expr) -> Expr:
     values for an expression to hold we can determine expressions with constant
     results (e.g. P∧¬P is always F).
 
+    Variables keep the first value they are required to hold, so the result
+    of reducing a node under a given constraint never changes. Both passes
+    are memoised on node identity and shared subexpressions are only
+    visited once.
+
     Args:
         expr: Expression to simplify.
 
@@ -296,70 +1311,168 @@ def simplify(expr: Expr) -> Expr:
          Variable(identifier='Q')
     """
     mapping = {}
-
-    def reduce_constexprs(expr: Expr, constraint: bool = True) -> bool:
-        if isinstance(expr, Variable):
-            val = mapping.get(expr, constraint)
-            if val != constraint:
-                return False
-            mapping[expr] = constraint
-        elif isinstance(expr, Negation):
-            return reduce_constexprs(expr.operand, not constraint)
-        elif isinstance(expr, Implication):
-            return reduce_constexprs(expr.premise, constraint) and reduce_constexprs(
-                expr.conclusion, constraint
-            )
-        elif isinstance(expr, Conjunction):
-            return reduce_constexprs(expr.lhs, True) and reduce_constexprs(
-                expr.rhs, True
-            )
-        elif isinstance(expr, Disjunction):
-            expr.lhs = expr.lhs if (lhs := reduce_constexprs(expr.lhs)) else lhs
-            expr.rhs = expr.rhs if (rhs := reduce_constexprs(expr.rhs)) else lhs
-            if lhs == rhs == False:
-                return False
-        return True
-
-    def rewrite(expr: Expr) -> bool:
+    reduced_memo = {}
+    rewrite_memo = {}
+
+    def reduce_constexprs(
+        expr: Expr, constraint: bool = True
+    ) -> Generator[Any, Tuple[bool, Expr], Tuple[bool, Expr]]:
+        key = (id(expr), constraint)
+        if (result := reduced_memo.get(key)) is None:
+            reducer = reducers.get(type(expr), reduce_constant)
+            result = reduced_memo[key] = yield reducer(expr, constraint)
+        return result
+
+    def reduce_constant(expr: Expr, constraint: bool) -> Tuple[bool, Expr]:
+        return True, expr
+
+    def reduce_variable(expr: Variable, constraint: bool) -> Tuple[bool, Expr]:
+        val = mapping.get(expr, constraint)
+        if val != constraint:
+            return False, expr
+        mapping[expr] = constraint
+        return True, expr
+
+    def reduce_negation(expr: Negation, constraint: bool) -> Generator:
+        reduced, operand = yield reduce_constexprs(expr.operand, not constraint)
+        return reduced, Negation(operand)
+
+    def reduce_implication(expr: Implication, constraint: bool) -> Generator:
+        reduced, premise = yield reduce_constexprs(expr.premise, constraint)
+        conclusion = expr.conclusion
+        if reduced:
+            reduced, conclusion = yield reduce_constexprs(conclusion, constraint)
+        return reduced, Implication(conclusion, premise)
+
+    def reduce_conjunction(expr: Conjunction, constraint: bool) -> Generator:
+        reduced, lhs = yield reduce_constexprs(expr.lhs, True)
+        rhs = expr.rhs
+        if reduced:
+            reduced, rhs = yield reduce_constexprs(rhs, True)
+        return reduced, Conjunction(lhs, rhs)
+
+    def reduce_disjunction(expr: Disjunction, constraint: bool) -> Generator:
+        lhs, lhs_expr = yield reduce_constexprs(expr.lhs)
+        rhs, rhs_expr = yield reduce_constexprs(expr.rhs)
+        expr = Disjunction(lhs_expr if lhs else lhs, rhs_expr if rhs else lhs)
+        if lhs == rhs == False:
+            return False, expr
+        return True, expr
+
+    def reduce_nary_conjunction(expr: NAryConjunction, constraint: bool) -> Generator:
+        reduced, operands = True, []
+        for operand in expr.operands:
+            if reduced:
+                reduced, operand = yield reduce_constexprs(operand, True)
+            operands.append(operand)
+        return reduced, NAryConjunction(tuple(operands))
+
+    def reduce_nary_disjunction(expr: NAryDisjunction, constraint: bool) -> Generator:
+        reduced, operands = False, []
+        for operand in expr.operands:
+            holds, operand = yield reduce_constexprs(operand)
+            reduced = reduced or holds
+            operands.append(operand if holds else False)
+        return reduced, NAryDisjunction(tuple(operands))
+
+    reducers = {
+        Variable: reduce_variable,
+        NAryConjunction: reduce_nary_conjunction,
+        NAryDisjunction: reduce_nary_disjunction,
+        Negation: reduce_negation,
+        Implication: reduce_implication,
+        Conjunction: reduce_conjunction,
+        Disjunction: reduce_disjunction,
+    }
+
+    def rewrite(expr: Expr) -> Generator[Any, Expr, Expr]:
+        if (result := rewrite_memo.get(id(expr))) is None:
+            result = rewrite_memo[id(expr)] = yield _rewrite(expr)
+        return result
+
+    def _rewrite(expr: Expr) -> Any:
         if isinstance(expr, Disjunction):
             if expr.lhs == expr.rhs == True:
                 return expr
             return rewrite(expr.lhs if expr.lhs else expr.rhs)
         elif isinstance(expr, Conjunction):
-            if expr.lhs == expr.rhs == True:
-                return rewrite(expr)
-            return False
+            return expr.lhs == expr.rhs == True
+        elif isinstance(expr, NAryDisjunction):
+            if all(operand == True for operand in expr.operands):
+                return expr
+            return rewrite(next(filter(None, expr.operands), expr.operands[-1]))
+        elif isinstance(expr, NAryConjunction):
+            return all(operand == True for operand in expr.operands)
         elif isinstance(expr, Implication):
-            expr.premise = rewrite(expr.premise)
-            expr.conclusion = rewrite(expr.conclusion)
+            return rewrite_implication(expr)
         elif isinstance(expr, Negation):
-            expr.operand = rewrite(expr.operand)
+            return rewrite_negation(expr)
         return expr
 
-    reduce_constexprs(expr)
-    return rewrite(expr)
+    def rewrite_implication(expr: Implication) -> Generator[Any, Expr, Expr]:
+        conclusion = yield rewrite(expr.conclusion)
+        return Implication(conclusion, (yield rewrite(expr.premise)))
+
+    def rewrite_negation(expr: Negation) -> Generator[Any, Expr, Expr]:
+        return Negation((yield rewrite(expr.operand)))
+
+    _, reduced = _trampoline(reduce_constexprs(expr))
+    return _trampoline(rewrite(reduced))
 
 
 def stringify(expr: Expr) -> str:
     """Transform IR into string.
 
+    Fragments are collected in output order by an iterative walk and joined
+    once, so the cost is linear in the size of the output. Constants are
+    written as `T` and `F`.
+
     Args:
         expr: Expression to transform.
 
     Returns:
         String representation of expression.
     """
-    if isinstance(expr, Variable):
-        return expr.identifier
-    if isinstance(expr, Negation):
-        return f"({Token.NEGATION.value}{stringify(expr.operand)})"
-    if isinstance(expr, Conjunction):
-        return (
-            f"({stringify(expr.lhs)} {Token.CONJUNCTION.value} {stringify(expr.rhs)})"
-        )
-    if isinstance(expr, Disjunction):
-        return (
-            f"({stringify(expr.lhs)} {Token.DISJUNCTION.value} {stringify(expr.rhs)})"
-        )
-    if isinstance(expr, Implication):
-        return f"({stringify(expr.premise)} {Token.IMPLICATION.value} {stringify(expr.conclusion)})"
+    fragments = []
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        if type(expr) is str:
+            fragments.append(expr)
+            continue
+        if type(expr) is Variable:
+            fragments.append(expr.identifier)
+            continue
+        if type(expr) is bool:
+            fragments.append("T" if expr else "F")
+            continue
+
+        first, *operands = _OPERANDS[type(expr)](expr)
+        operator = _OP_STR[type(expr)]
+        stack.append(")")
+        for child in reversed(operands):
+            stack.extend((child, operator))
+        if operands:
+            stack.extend((first, "("))
+        else:
+            stack.extend((first, operator, "("))
+    return "".join(fragments)
+
+
+_OPERANDS = {
+    Negation: lambda expr: (expr.operand,),
+    Conjunction: attrgetter("lhs", "rhs"),
+    Disjunction: attrgetter("lhs", "rhs"),
+    Implication: attrgetter("premise", "conclusion"),
+    NAryConjunction: attrgetter("operands"),
+    NAryDisjunction: attrgetter("operands"),
+}
+
+_OP_STR = {
+    Negation: Token.NEGATION.value,
+    Conjunction: f" {Token.CONJUNCTION.value} ",
+    Disjunction: f" {Token.DISJUNCTION.value} ",
+    Implication: f" {Token.IMPLICATION.value} ",
+    NAryConjunction: f" {Token.CONJUNCTION.value} ",
+    NAryDisjunction: f" {Token.DISJUNCTION.value} ",
+}